@@ -1,5 +1,34 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.contenttypes.models import ContentType
+from coregame.api_views import ALLOWED_SIZES
 from coregame.models import GameScoring
+from coregame.pagination import EstimatedCountPaginator
+
+ACTION_BATCH_SIZE = 1000
+# Rows deleted by one run of an action, so it fits in a request's time limit
+ACTION_MAX_ROWS = 20000
+
+
+class BoardSizeFilter(admin.SimpleListFilter):
+    """
+    Filter by the allowed board sizes, instead of the distinct board sizes
+    found on the table (a full scan on big tables).
+    """
+
+    title = "board size"
+    parameter_name = "board_size"
+
+    def lookups(self, request, model_admin):
+        return [(size, f"{size}x{size}") for size in ALLOWED_SIZES]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        if self.value() not in {str(size) for size in ALLOWED_SIZES}:
+            raise IncorrectLookupParameters(self.value())
+        return queryset.filter(board_size=self.value())
 
 
 @admin.register(GameScoring)
@@ -10,3 +39,60 @@ class GameScoringAdmin(admin.ModelAdmin):
         "timing",
         "board_size",
     ]
+    list_select_related = ["player"]
+    list_filter = [BoardSizeFilter]
+    # Exact matches use the unique index on the username
+    search_fields = ["=player__username"]
+    raw_id_fields = ["player"]
+    # Sorting on other columns sorts the whole table
+    sortable_by = ["id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["delete_in_batches"]
+
+    def get_actions(self, request):
+        # The stock action loads every selected row on its confirmation page
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    @admin.action(
+        description="Delete selected game scorings in batches",
+        permissions=["delete"],
+    )
+    def delete_in_batches(self, request, queryset):
+        content_type = ContentType.objects.get_for_model(GameScoring)
+        deleted = 0
+        while deleted < ACTION_MAX_ROWS:
+            batch = list(
+                queryset.select_related(None).order_by("pk").only("pk")[
+                    :min(ACTION_BATCH_SIZE, ACTION_MAX_ROWS - deleted)
+                ]
+            )
+            if not batch:
+                break
+            # One query per batch instead of one ModelAdmin.log_deletion()
+            # per row.
+            LogEntry.objects.bulk_create(
+                LogEntry(
+                    user_id=request.user.pk,
+                    content_type_id=content_type.pk,
+                    object_id=str(obj.pk),
+                    object_repr=str(obj)[:200],
+                    action_flag=DELETION,
+                )
+                for obj in batch
+            )
+            deleted += GameScoring.objects.filter(
+                pk__in=[obj.pk for obj in batch]
+            ).delete()[0]
+        self.message_user(
+            request, f"Deleted {deleted} game scorings.", messages.SUCCESS
+        )
+        if deleted >= ACTION_MAX_ROWS and queryset.exists():
+            self.message_user(
+                request,
+                f"Stopped after {ACTION_MAX_ROWS} rows, run the action again "
+                "to delete the remaining ones.",
+                messages.WARNING,
+            )
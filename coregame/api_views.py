@@ -1,33 +1,96 @@
 from urllib.request import Request
 from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.settings import api_settings
+from coregame import daily
 from coregame.models import GameScoring
+from coregame.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    paginate_scores,
+)
+from coregame.renderers import PackedScoresRenderer, pack_scores
+import datetime
 import json
 
 ALLOWED_SIZES = [7, 10, 12, 15, 20]
 
 
 @api_view(["GET"])
+@renderer_classes(
+    [*api_settings.DEFAULT_RENDERER_CLASSES, PackedScoresRenderer]
+)
 def get_scores(request: Request) -> JsonResponse:
     """
-    Return a list of scores, a dict with player name, timing in seconds and
-    board size.
+    Return a page of scores, a list of dicts with player name, timing in
+    seconds and board size, ordered by board size, timing and id.
+
+    Query parameters:
+        board_size: Only return scores of this board size.
+        player: Only return scores of this player (username).
+        limit: Page size, up to MAX_PAGE_SIZE (default DEFAULT_PAGE_SIZE).
+        cursor: The "next" attribute of the previous page.
+
+    The "next" attribute of the response is the cursor of the following page,
+    or None on the last page.
+
+    Clients accepting "application/vnd.minesweeper.packed+json" (or asking
+    for "?format=packed") get the same scores packed in columns instead, see
+    coregame.renderers.pack_scores().
     """
-    out = []
+    params = request.GET
     scores = GameScoring.objects.all()
-    for score in scores:
-        if score.board_size not in ALLOWED_SIZES:
-            continue
-        out.append(
+    board_sizes = ALLOWED_SIZES
+    try:
+        if "board_size" in params:
+            board_sizes = [
+                size for size in ALLOWED_SIZES
+                if size == int(params["board_size"])
+            ]
+        limit = int(params.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"err": "Bad Request", "scores": []}, status=400)
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        return JsonResponse({"err": "Invalid limit", "scores": []},
+                            status=400)
+    if "player" in params:
+        scores = scores.filter(player__username=params["player"])
+    scores = scores.values("id", "player__username", "timing", "board_size")
+    try:
+        page, next_cursor = paginate_scores(
+            scores, board_sizes, params.get("cursor"), limit
+        )
+    except InvalidCursor:
+        return JsonResponse({"err": "Invalid cursor", "scores": []},
+                            status=400)
+    if request.accepted_renderer.format == PackedScoresRenderer.format:
+        packed = pack_scores(
+            (row["player__username"], row["timing"], row["board_size"])
+            for row in page
+        )
+        response = JsonResponse(
+            {"err": None, **packed, "next": next_cursor},
+            status=200,
+            content_type=PackedScoresRenderer.media_type,
+        )
+    else:
+        out = [
             {
-                "player": score.player.username,
-                "timing": score.timing,
-                "board_size": score.board_size,
+                "player": row["player__username"],
+                "timing": row["timing"],
+                "board_size": row["board_size"],
             }
+            for row in page
+        ]
+        response = JsonResponse(
+            {"err": None, "scores": out, "next": next_cursor}, status=200
         )
-    return JsonResponse({"err": None, "scores": out}, status=200)
+    patch_vary_headers(response, ["Accept"])
+    return response
 
 
 @login_required
@@ -72,3 +135,95 @@ def set_score(request: Request, board: int) -> JsonResponse:
         )
         return JsonResponse({"err": None, "accepted": True}, status=200)
     return JsonResponse({"err": None, "accepted": False}, status=200)
+
+
+@api_view(["GET"])
+def get_daily_challenge(request: Request, board: int) -> JsonResponse:
+    """
+    Return today's challenge board of a given size: its mine cells as
+    [row, col] pairs, the blank cell to start from, its 3BV and whether it
+    can be solved without guessing.
+
+    The game runs on the browser, so the mine cells are readable from the
+    network before playing; set_daily_score() can only reject timings too
+    short to be played by hand.
+    """
+    challenge = daily.get_challenge(daily.today(), board)
+    if challenge is None:
+        return JsonResponse(
+            {"err": "No daily challenge", "challenge": None}, status=404
+        )
+    return JsonResponse(
+        {
+            "err": None,
+            "challenge": {
+                "day": challenge.day,
+                "board_size": challenge.board_size,
+                "mines": challenge.mines,
+                "start": [challenge.start_row, challenge.start_col],
+                "three_bv": challenge.three_bv,
+                "solvable": challenge.solvable,
+            },
+        },
+        status=200,
+    )
+
+
+@api_view(["GET"])
+def get_daily_scores(request: Request, board: int) -> JsonResponse:
+    """
+    Return the ranking of a given board size, a list of dicts with player
+    name and timing in seconds, best first.
+
+    Query parameters:
+        day: Day of the challenge (YYYY-MM-DD), default today (UTC).
+    """
+    try:
+        day = datetime.date.fromisoformat(
+            request.GET.get("day", daily.today().isoformat())
+        )
+    except ValueError:
+        return JsonResponse({"err": "Bad Request", "scores": []}, status=400)
+    challenge = daily.get_challenge(day, board)
+    if challenge is None or day > daily.today():
+        return JsonResponse(
+            {"err": "No daily challenge", "scores": []}, status=404
+        )
+    out = [
+        {"player": player, "timing": timing}
+        for timing, _, player in daily.get_ranking(challenge)
+    ]
+    return JsonResponse({"err": None, "scores": out}, status=200)
+
+
+@login_required
+@api_view(["PUT"])
+def set_daily_score(request: Request, board: int) -> JsonResponse:
+    """
+    Save the player's timing on a challenge of a given board size if it
+    beats their best one, and return the "accepted" attribute set to True,
+    otherwise return the "accepted" attribute set to False.
+
+    The body holds the "timing" and the "day" of the challenge played, only
+    today's challenge accepts scores.
+    """
+    try:
+        content = json.loads(request.body)
+        timing = int(content["timing"])
+        day = datetime.date.fromisoformat(content["day"])
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return JsonResponse({"err": "Bad Request", "accepted": False},
+                            status=400)
+    if day != daily.today():
+        return JsonResponse({"err": "Challenge over", "accepted": False},
+                            status=400)
+    challenge = daily.get_challenge(day, board)
+    if challenge is None:
+        return JsonResponse(
+            {"err": "No daily challenge", "accepted": False}, status=404
+        )
+    if timing <= 0 or not daily.is_plausible(challenge, timing):
+        return JsonResponse({"err": "Bad score", "accepted": False},
+                            status=400)
+    accepted = daily.submit_score(challenge, request.user, timing)
+    return JsonResponse({"err": None, "accepted": accepted}, status=200)
@@ -0,0 +1,220 @@
+"""
+Daily challenge: every player gets the same seeded board of each size for the
+day, and a per-day ranking kept in the cache and updated on each new score.
+
+Each process keeps its own copy of the challenges (CHALLENGE_CACHE) for
+CHALLENGE_CACHE_TIMEOUT seconds at most, so a board regenerated with --force
+reaches every worker within that time. The rankings change on every score and
+live in a cache shared by all the workers (RANKING_CACHE, see CACHES in the
+settings), or each one would serve its own copy.
+"""
+import bisect
+import datetime
+import hashlib
+import random
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from coregame import engine
+from coregame.models import DailyChallenge, DailyScore
+
+RANKING_SIZE = 100
+GENERATION_ATTEMPTS = 200
+# Clearing speed no player reaches (world records are below 5 3BV/s)
+MAX_3BV_PER_SECOND = 5
+CHALLENGE_CACHE = "default"
+CHALLENGE_CACHE_TIMEOUT = 300
+RANKING_CACHE = "shared"
+
+
+def today() -> datetime.date:
+    return timezone.now().date()
+
+
+def daily_seed(day: datetime.date, board_size: int) -> int:
+    """
+    Return the seed of the board of a given day and size, the same on every
+    host and run.
+    """
+    digest = hashlib.sha256(f"{day.isoformat()}:{board_size}".encode())
+    return int.from_bytes(digest.digest()[:7], "big")
+
+
+def generate_board(seed: int, board_size: int) -> dict:
+    """
+    Return the DailyChallenge fields of the first board the seed generates
+    that can be solved without guessing from a blank start cell. Fall back to
+    the last board tried with a blank cell (solvable=False) after
+    GENERATION_ATTEMPTS boards, raise ValueError if none had one.
+    """
+    rng = random.Random(seed)
+    count = engine.mine_count(board_size)
+    board = None
+    for _ in range(GENERATION_ATTEMPTS):
+        mines = engine.place_mines(board_size, count, rng)
+        counts = engine.count_board(board_size, mines)
+        blanks = [
+            (row, col)
+            for row in range(board_size)
+            for col in range(board_size)
+            if counts[row][col] == 0
+        ]
+        if not blanks:
+            continue
+        start = rng.choice(blanks)
+        solvable = engine.is_solvable(board_size, mines, start, counts)
+        board = mines, counts, start, solvable
+        if solvable:
+            break
+    if board is None:
+        raise ValueError(
+            f"No {board_size}x{board_size} board with a blank cell was "
+            f"generated in {GENERATION_ATTEMPTS} attempts"
+        )
+    mines, counts, start, solvable = board
+    return {
+        "mines": sorted(list(cell) for cell in mines),
+        "start_row": start[0],
+        "start_col": start[1],
+        "three_bv": engine.three_bv(board_size, mines, counts),
+        "solvable": solvable,
+    }
+
+
+def _challenge_key(day: datetime.date, board_size: int) -> str:
+    return f"coregame:daily:{day.isoformat()}:{board_size}"
+
+
+def _ranking_key(challenge: DailyChallenge) -> str:
+    return f"coregame:daily-ranking:{challenge.id}"
+
+
+def _cache_timeout(day: datetime.date) -> int:
+    """
+    Return the seconds from now to the end of the day after the given one,
+    so the boards generated ahead stay cached through midnight.
+    """
+    expiry = datetime.datetime.combine(
+        day + datetime.timedelta(days=2), datetime.time.min,
+        tzinfo=datetime.timezone.utc,
+    )
+    return max(int((expiry - timezone.now()).total_seconds()), 60)
+
+
+def _challenge_timeout(day: datetime.date) -> int:
+    return min(_cache_timeout(day), CHALLENGE_CACHE_TIMEOUT)
+
+
+def create_challenge(day: datetime.date, board_size: int,
+                     force: bool = False) -> tuple:
+    """
+    Generate, save and cache the challenge of a given day and size. Return
+    (challenge, created); an existing challenge is kept unless force is set,
+    in which case it is generated again and its scores are deleted.
+    """
+    challenge = DailyChallenge.objects.filter(
+        day=day, board_size=board_size
+    ).first()
+    if challenge is not None and not force:
+        created = False
+    else:
+        seed = daily_seed(day, board_size)
+        with transaction.atomic():
+            challenge, created = DailyChallenge.objects.update_or_create(
+                day=day,
+                board_size=board_size,
+                defaults={"seed": seed, **generate_board(seed, board_size)},
+            )
+            if not created:
+                challenge.scores.all().delete()
+                caches[RANKING_CACHE].delete(_ranking_key(challenge))
+    caches[CHALLENGE_CACHE].set(
+        _challenge_key(day, board_size), challenge, _challenge_timeout(day)
+    )
+    return challenge, created
+
+
+def get_challenge(day: datetime.date, board_size: int) -> DailyChallenge:
+    """
+    Return the challenge of a given day and size from the process' cache or
+    the database, None if it was not generated.
+    """
+    key = _challenge_key(day, board_size)
+    challenge = caches[CHALLENGE_CACHE].get(key)
+    if challenge is None:
+        challenge = DailyChallenge.objects.filter(
+            day=day, board_size=board_size
+        ).first()
+        if challenge is not None:
+            caches[CHALLENGE_CACHE].set(key, challenge,
+                                        _challenge_timeout(day))
+    return challenge
+
+
+def _load_ranking(challenge: DailyChallenge) -> list:
+    return [
+        tuple(row)
+        for row in DailyScore.objects.filter(challenge=challenge)
+        .order_by("timing", "id")
+        .values_list("timing", "id", "player__username")[:RANKING_SIZE]
+    ]
+
+
+def get_ranking(challenge: DailyChallenge) -> list:
+    """
+    Return the best RANKING_SIZE (timing, score id, player) entries of a
+    challenge, ordered by timing and id.
+
+    The ranking is read from the database once and then kept up to date in
+    the (shared) cache by submit_score().
+    """
+    key = _ranking_key(challenge)
+    ranking = caches[RANKING_CACHE].get(key)
+    if ranking is None:
+        ranking = _load_ranking(challenge)
+        # add() does not overwrite a ranking submit_score() has cached since
+        # this one was read from the database.
+        caches[RANKING_CACHE].add(key, ranking,
+                                  _cache_timeout(challenge.day))
+    return ranking
+
+
+def is_plausible(challenge: DailyChallenge, timing: int) -> bool:
+    """
+    Return False if the timing is too short to clear the board by hand.
+
+    The mine cells are sent to the client, so this only rejects the grossest
+    forged timings; see get_daily_challenge().
+    """
+    return timing * MAX_3BV_PER_SECOND >= challenge.three_bv
+
+
+def submit_score(challenge: DailyChallenge, player, timing: int) -> bool:
+    """
+    Save the player's timing if it beats their best on the challenge and
+    move it into place in the cached ranking. Return True if it was saved.
+    """
+    with transaction.atomic():
+        # Locking the challenge row makes the submissions of a challenge, on
+        # every worker, update the cached ranking one at a time. SQLite
+        # ignores it but serializes the transactions from their first write.
+        DailyChallenge.objects.select_for_update().get(pk=challenge.pk)
+        score, created = DailyScore.objects.get_or_create(
+            challenge=challenge, player=player, defaults={"timing": timing}
+        )
+        if not created:
+            if timing >= score.timing:
+                return False
+            score.timing = timing
+            score.save(update_fields=["timing"])
+        key = _ranking_key(challenge)
+        ranking = caches[RANKING_CACHE].get(key)
+        if ranking is None:
+            ranking = _load_ranking(challenge)
+        # Timings only improve, so replacing the player's entry and trimming
+        # the tail keeps the top of the ranking exact.
+        ranking = [entry for entry in ranking if entry[1] != score.id]
+        bisect.insort(ranking, (timing, score.id, player.username))
+        caches[RANKING_CACHE].set(key, ranking[:RANKING_SIZE],
+                                  _cache_timeout(challenge.day))
+    return True
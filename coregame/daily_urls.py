@@ -0,0 +1,12 @@
+from django.urls import path
+from coregame.api_views import (
+    get_daily_challenge,
+    get_daily_scores,
+    set_daily_score,
+)
+
+urlpatterns = [
+    path("<int:board>/", get_daily_challenge, name="get_daily_challenge"),
+    path("<int:board>/scores/", get_daily_scores, name="get_daily_scores"),
+    path("<int:board>/score/", set_daily_score, name="set_daily_score"),
+]
@@ -0,0 +1,258 @@
+"""
+Python counterpart of the board logic in static/js/minesweeper.js and
+static/js/cells.js, used to generate and analyse boards on the server.
+
+Cells are (row, col) tuples and a board is the frozenset of its mine cells.
+"""
+import math
+import random
+
+MINE_RATIO = 15  # percentage of total cells, as Minesweeper.mineRatio
+
+
+def mine_count(size: int, ratio: int = MINE_RATIO) -> int:
+    """
+    Return the amount of mines on a board, as Minesweeper.placeCellsAndMines_.
+    """
+    return math.ceil(size * size * ratio / 100)
+
+
+def place_mines(size: int, count: int, rng) -> frozenset:
+    """
+    Return a board with count mines randomly placed by rng (random.Random).
+    """
+    cells = rng.sample(range(size * size), count)
+    return frozenset(divmod(cell, size) for cell in cells)
+
+
+def neighbours(size: int, row: int, col: int) -> list:
+    """
+    Return the cells surrounding (row, col), as Cell.getSurroundings.
+    """
+    return [
+        (rr, cc)
+        for rr in range(max(row - 1, 0), min(row + 2, size))
+        for cc in range(max(col - 1, 0), min(col + 2, size))
+        if (rr, cc) != (row, col)
+    ]
+
+
+def count_board(size: int, mines: frozenset) -> list:
+    """
+    Return a size x size list with the amount of surrounding mines of each
+    cell, -1 on mine cells.
+    """
+    counts = [[0] * size for _ in range(size)]
+    for row, col in mines:
+        counts[row][col] = -1
+        for rr, cc in neighbours(size, row, col):
+            if counts[rr][cc] != -1:
+                counts[rr][cc] += 1
+    return counts
+
+
+def open_cell(size: int, counts: list, cell: tuple, revealed: set) -> set:
+    """
+    Reveal a safe cell and, if it is blank, the surrounding cells in a chain
+    reaction, as BlankCell.click. Return the cells newly revealed.
+    """
+    opened = set()
+    pending = [cell]
+    while pending:
+        row, col = pending.pop()
+        if (row, col) in revealed or (row, col) in opened:
+            continue
+        opened.add((row, col))
+        if counts[row][col] == 0:
+            pending.extend(neighbours(size, row, col))
+    revealed |= opened
+    return opened
+
+
+def three_bv(size: int, mines: frozenset, counts: list = None) -> int:
+    """
+    Return the 3BV of a board: the minimum amount of clicks to clear it,
+    counting each blank area once plus each number cell not bordering one.
+    """
+    counts = counts or count_board(size, mines)
+    revealed = set()
+    clicks = 0
+    for row in range(size):
+        for col in range(size):
+            if counts[row][col] == 0 and (row, col) not in revealed:
+                open_cell(size, counts, (row, col), revealed)
+                clicks += 1
+    for row in range(size):
+        for col in range(size):
+            if counts[row][col] > 0 and (row, col) not in revealed:
+                clicks += 1
+    return clicks
+
+
+def deduce(size: int, counts: list, revealed: set, flagged: set,
+           frontier: set = None) -> tuple:
+    """
+    Return the (safe, mines) sets of hidden cells that follow logically from
+    the revealed numbers, flagged being the mines already known. Only the
+    frontier cells are looked at if given, see play_game().
+
+    Applies the single cell rules (a number already satisfied by its flags,
+    or with as many hidden cells as missing mines) and the subset rule
+    between pairs of neighbouring numbers.
+    """
+    safe = set()
+    mines = set()
+    constraints = []
+    for row, col in revealed if frontier is None else frontier:
+        if counts[row][col] <= 0:
+            continue
+        hidden = set()
+        missing = counts[row][col]
+        for cell in neighbours(size, row, col):
+            if cell in flagged:
+                missing -= 1
+            elif cell not in revealed:
+                hidden.add(cell)
+        if not hidden:
+            continue
+        if missing == 0:
+            safe |= hidden
+        elif missing == len(hidden):
+            mines |= hidden
+        else:
+            constraints.append((frozenset(hidden), missing))
+    if safe or mines:
+        return safe, mines
+    for hidden_a, missing_a in constraints:
+        for hidden_b, missing_b in constraints:
+            if hidden_a is hidden_b or not hidden_a < hidden_b:
+                continue
+            rest = hidden_b - hidden_a
+            if missing_b == missing_a:
+                safe |= rest
+            elif missing_b - missing_a == len(rest):
+                mines |= rest
+    return safe, mines
+
+
+def is_solvable(size: int, mines: frozenset, start: tuple,
+                counts: list = None) -> bool:
+    """
+    Return True if the board can be cleared from the start cell without
+    guessing, using only the deduce() rules.
+    """
+    counts = counts or count_board(size, mines)
+    revealed = set()
+    flagged = set()
+    open_cell(size, counts, start, revealed)
+    while len(revealed) + len(mines) < size * size:
+        safe, found = deduce(size, counts, revealed, flagged)
+        if not safe and not found:
+            return False
+        flagged |= found
+        for cell in safe:
+            open_cell(size, counts, cell, revealed)
+    return True
+
+
+def guess_cell(size: int, counts: list, revealed: set, flagged: set,
+               total_mines: int, rng, frontier: set = None) -> tuple:
+    """
+    Return the hidden cell least likely to hold a mine, ties broken by rng.
+
+    The risk of a cell next to revealed numbers is the highest ratio of
+    missing mines to hidden cells among those numbers, other cells take the
+    density of the mines left over the hidden cells. Only the frontier cells
+    are looked at if given, see play_game().
+    """
+    risk = {}
+    for row, col in revealed if frontier is None else frontier:
+        if counts[row][col] <= 0:
+            continue
+        hidden = []
+        missing = counts[row][col]
+        for cell in neighbours(size, row, col):
+            if cell in flagged:
+                missing -= 1
+            elif cell not in revealed:
+                hidden.append(cell)
+        for cell in hidden:
+            risk[cell] = max(risk.get(cell, 0), missing / len(hidden))
+    unknown = [
+        (row, col)
+        for row in range(size)
+        for col in range(size)
+        if (row, col) not in revealed and (row, col) not in flagged
+    ]
+    density = (total_mines - len(flagged)) / len(unknown)
+    lowest = min(risk.get(cell, density) for cell in unknown)
+    return rng.choice(
+        [cell for cell in unknown if risk.get(cell, density) == lowest]
+    )
+
+
+def play_game(size: int, mines: frozenset, rng) -> tuple:
+    """
+    Play a game the way a careful player would: click the cells deduce()
+    proves safe and guess with guess_cell() only when stuck, starting with a
+    guess as on the app (mines are placed before the first click).
+
+    Return (won, clicks, guesses).
+    """
+    counts = count_board(size, mines)
+    revealed = set()
+    flagged = set()
+    # Revealed numbers that may still border hidden cells
+    frontier = set()
+    safe = set()
+    clicks = 0
+    guesses = 0
+    while len(revealed) + len(mines) < size * size:
+        if not safe and revealed:
+            frontier = {
+                (row, col)
+                for row, col in frontier
+                if any(cell not in revealed and cell not in flagged
+                       for cell in neighbours(size, row, col))
+            }
+            safe, found = deduce(size, counts, revealed, flagged, frontier)
+            while found and not safe:
+                flagged |= found
+                safe, found = deduce(
+                    size, counts, revealed, flagged, frontier
+                )
+            flagged |= found
+        if safe:
+            cell = safe.pop()
+            if cell in revealed:
+                continue
+        else:
+            cell = guess_cell(size, counts, revealed, flagged, len(mines),
+                              rng, frontier)
+            guesses += 1
+        clicks += 1
+        if cell in mines:
+            return False, clicks, guesses
+        frontier |= {
+            (row, col)
+            for row, col in open_cell(size, counts, cell, revealed)
+            if counts[row][col] > 0
+        }
+    return True, clicks, guesses
+
+
+def simulate(task: tuple) -> tuple:
+    """
+    Play a batch of games on fresh boards; task is (size, ratio, games,
+    seed). Return (size, ratio, [(won, clicks, guesses), ...]).
+
+    Kept at module level so a process pool can run it.
+    """
+    size, ratio, games, seed = task
+    rng = random.Random(seed)
+    count = mine_count(size, ratio)
+    results = [
+        play_game(size, place_mines(size, count, rng), rng)
+        for _ in range(games)
+    ]
+    return size, ratio, results
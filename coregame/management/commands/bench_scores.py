@@ -0,0 +1,107 @@
+import json
+import random
+import time
+import timeit
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from coregame.api_views import ALLOWED_SIZES, get_scores
+from coregame.models import GameScoring
+from coregame.pagination import MAX_PAGE_SIZE
+from coregame.renderers import PackedScoresRenderer
+
+FORMATS = [
+    ("verbose", "application/json"),
+    ("packed", PackedScoresRenderer.media_type),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic leaderboard and compare payload size and response "
+        "time of the verbose and the packed scores formats through the "
+        "scores API: a full page (limit=MAX_PAGE_SIZE) and a cursor walk "
+        "over every score. The seeded rows are rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entries", type=int, default=10000,
+                            help="Scores to seed.")
+        parser.add_argument("--players", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        for option in ["entries", "players", "repeat"]:
+            if options[option] is None or options[option] < 1:
+                raise CommandError(f"--{option} must be a positive number")
+        with transaction.atomic():
+            self.seed(options["entries"], options["players"])
+            self.stdout.write(
+                f"{GameScoring.objects.count()} scores "
+                f"({options['entries']} seeded), {MAX_PAGE_SIZE} per page, "
+                f"best of {options['repeat']} runs"
+            )
+            for name, accept in FORMATS:
+                size, _ = self.walk(accept, first_page_only=True)
+                best = min(timeit.repeat(
+                    lambda: self.walk(accept, first_page_only=True),
+                    number=1, repeat=options["repeat"],
+                ))
+                self.stdout.write(
+                    f"{name:>8} page: {size:>10} bytes "
+                    f"{best * 1000:>8.2f} ms"
+                )
+                size, pages = self.walk(accept)
+                best = min(timeit.repeat(
+                    lambda: self.walk(accept),
+                    number=1, repeat=options["repeat"],
+                ))
+                self.stdout.write(
+                    f"{name:>8} walk: {size:>10} bytes "
+                    f"{best * 1000:>8.2f} ms ({pages} pages)"
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, entries: int, players: int):
+        rng = random.Random(0)
+        suffix = time.time_ns()
+        users = User.objects.bulk_create(
+            User(username=f"bench{suffix}-{ii}") for ii in range(players)
+        )
+        GameScoring.objects.bulk_create(
+            (
+                GameScoring(
+                    player=rng.choice(users),
+                    timing=rng.randint(1, 3600),
+                    board_size=rng.choice(ALLOWED_SIZES),
+                )
+                for _ in range(entries)
+            ),
+            batch_size=1000,
+        )
+
+    def walk(self, accept: str, first_page_only: bool = False) -> tuple:
+        """
+        Request the pages of scores through get_scores() until the last one
+        (or only the first one) and return (total bytes, pages).
+        """
+        factory = RequestFactory()
+        params = {"limit": MAX_PAGE_SIZE}
+        size = 0
+        pages = 0
+        while True:
+            response = get_scores(
+                factory.get("/coregame/scores/", params, HTTP_ACCEPT=accept)
+            )
+            if response.status_code != 200:
+                raise CommandError(
+                    f"Scores API answered {response.status_code}: "
+                    f"{response.content.decode()}"
+                )
+            size += len(response.content)
+            pages += 1
+            next_cursor = json.loads(response.content)["next"]
+            if first_page_only or next_cursor is None:
+                return size, pages
+            params["cursor"] = next_cursor
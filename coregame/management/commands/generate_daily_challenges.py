@@ -0,0 +1,50 @@
+import datetime
+from django.core.management.base import BaseCommand
+from coregame.api_views import ALLOWED_SIZES
+from coregame.daily import create_challenge, today
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the daily challenge boards of every allowed size. Schedule "
+        "it before midnight UTC with --days 2 so tomorrow's boards are ready "
+        "when the day starts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="First day to generate (YYYY-MM-DD), default today (UTC).",
+        )
+        parser.add_argument("--days", type=int, default=1)
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help=(
+                "Regenerate existing challenges and delete their scores. The "
+                "boards are seeded by day and size, so they only change if "
+                "the generator did."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        first = options["date"] or today()
+        for offset in range(options["days"]):
+            day = first + datetime.timedelta(days=offset)
+            for size in ALLOWED_SIZES:
+                challenge, created = create_challenge(
+                    day, size, force=options["force"]
+                )
+                if created:
+                    action = "generated"
+                elif options["force"]:
+                    action = "regenerated"
+                else:
+                    action = "kept"
+                self.stdout.write(
+                    f"{day} {size}x{size}: {action}, "
+                    f"3BV {challenge.three_bv}, "
+                    f"{'solvable' if challenge.solvable else 'needs guessing'}"
+                )
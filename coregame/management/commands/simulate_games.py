@@ -0,0 +1,90 @@
+import csv
+import os
+import random
+from collections import defaultdict
+from multiprocessing import Pool
+from django.core.management.base import BaseCommand, CommandError
+from coregame import engine
+from coregame.api_views import ALLOWED_SIZES
+
+
+class Command(BaseCommand):
+    help = (
+        "Play games headlessly with the Python engine across board sizes and "
+        "mine ratios, and report win rate, clicks and guesses per "
+        "configuration."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+",
+                            default=ALLOWED_SIZES)
+        parser.add_argument("--ratios", type=int, nargs="+",
+                            default=[engine.MINE_RATIO],
+                            help="Mine ratios, in percentage of the cells.")
+        parser.add_argument("--games", type=int, default=1000,
+                            help="Games per configuration.")
+        parser.add_argument("--batch", type=int, default=500,
+                            help="Games per task sent to a worker.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default=None,
+                            help="CSV file to stream every game result to.")
+
+    def handle(self, *args, **options):
+        for option in ["games", "batch", "workers"]:
+            if options[option] is None or options[option] < 1:
+                raise CommandError(f"--{option} must be a positive number")
+        for size in options["sizes"]:
+            for ratio in options["ratios"]:
+                if not 0 < engine.mine_count(size, ratio) < size * size:
+                    raise CommandError(
+                        f"Mine ratio {ratio}% does not fit a {size}x{size} "
+                        "board"
+                    )
+        rng = random.Random(options["seed"])
+        tasks = []
+        for size in options["sizes"]:
+            for ratio in options["ratios"]:
+                for start in range(0, options["games"], options["batch"]):
+                    games = min(options["batch"], options["games"] - start)
+                    tasks.append((size, ratio, games, rng.getrandbits(64)))
+
+        totals = defaultdict(lambda: [0, 0, 0, 0])
+        output = None
+        if options["output"]:
+            output = open(options["output"], "w", newline="")
+            writer = csv.writer(output)
+            writer.writerow(
+                ["board_size", "mine_ratio", "won", "clicks", "guesses"]
+            )
+        try:
+            with Pool(options["workers"]) as pool:
+                for size, ratio, results in pool.imap_unordered(
+                    engine.simulate, tasks
+                ):
+                    total = totals[size, ratio]
+                    for won, clicks, guesses in results:
+                        total[0] += 1
+                        total[1] += won
+                        total[2] += clicks
+                        total[3] += guesses
+                    if output:
+                        writer.writerows(
+                            (size, ratio, int(won), clicks, guesses)
+                            for won, clicks, guesses in results
+                        )
+        finally:
+            if output:
+                output.close()
+
+        self.stdout.write(
+            f"{'size':>5} {'ratio':>6} {'mines':>6} {'games':>9} "
+            f"{'win rate':>9} {'clicks':>7} {'guesses':>8} {'guess %':>8}"
+        )
+        for size, ratio in sorted(totals):
+            games, wins, clicks, guesses = totals[size, ratio]
+            self.stdout.write(
+                f"{size:>5} {ratio:>5}% {engine.mine_count(size, ratio):>6} "
+                f"{games:>9} {wins / games:>9.1%} {clicks / games:>7.1f} "
+                f"{guesses / games:>8.2f} {guesses / clicks:>8.1%}"
+            )
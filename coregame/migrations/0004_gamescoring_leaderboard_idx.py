@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-19 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("coregame", "0003_alter_gamescoring_board_size"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="gamescoring",
+            index=models.Index(
+                fields=["board_size", "timing", "id"], name="coregame_leaderboard_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.4 on 2026-10-19 20:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("coregame", "0004_gamescoring_leaderboard_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyChallenge",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("board_size", models.PositiveIntegerField()),
+                ("seed", models.BigIntegerField()),
+                ("mines", models.JSONField()),
+                ("start_row", models.PositiveIntegerField()),
+                ("start_col", models.PositiveIntegerField()),
+                ("three_bv", models.PositiveIntegerField()),
+                ("solvable", models.BooleanField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DailyScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("timing", models.PositiveIntegerField()),
+                (
+                    "challenge",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scores",
+                        to="coregame.dailychallenge",
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_scores",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="dailychallenge",
+            constraint=models.UniqueConstraint(
+                fields=("day", "board_size"), name="coregame_unique_daily_challenge"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dailyscore",
+            index=models.Index(
+                fields=["challenge", "timing", "id"], name="coregame_daily_ranking_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyscore",
+            constraint=models.UniqueConstraint(
+                fields=("challenge", "player"), name="coregame_unique_daily_score"
+            ),
+        ),
+    ]
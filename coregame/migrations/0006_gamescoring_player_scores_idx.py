@@ -0,0 +1,19 @@
+# Generated by Django 4.2.4 on 2026-10-19 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("coregame", "0005_dailychallenge_dailyscore"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="gamescoring",
+            index=models.Index(
+                fields=["player", "board_size", "timing", "id"],
+                name="coregame_player_scores_idx",
+            ),
+        ),
+    ]
@@ -12,3 +12,65 @@ class GameScoring(models.Model):
     )
     timing = models.PositiveIntegerField(null=True)
     board_size = models.PositiveIntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the leaderboard, see coregame.pagination
+            models.Index(
+                fields=["board_size", "timing", "id"],
+                name="coregame_leaderboard_idx",
+            ),
+            # Same, for the scores of a player
+            models.Index(
+                fields=["player", "board_size", "timing", "id"],
+                name="coregame_player_scores_idx",
+            ),
+        ]
+
+
+class DailyChallenge(models.Model):
+    day = models.DateField()
+    board_size = models.PositiveIntegerField()
+    seed = models.BigIntegerField()
+    mines = models.JSONField()
+    start_row = models.PositiveIntegerField()
+    start_col = models.PositiveIntegerField()
+    three_bv = models.PositiveIntegerField()
+    solvable = models.BooleanField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "board_size"],
+                name="coregame_unique_daily_challenge",
+            ),
+        ]
+
+
+class DailyScore(models.Model):
+    challenge = models.ForeignKey(
+        DailyChallenge,
+        related_name="scores",
+        on_delete=models.CASCADE,
+    )
+    player = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="daily_scores",
+        on_delete=models.CASCADE,
+    )
+    timing = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["challenge", "player"],
+                name="coregame_unique_daily_score",
+            ),
+        ]
+        indexes = [
+            # Per-day ranking, see coregame.daily
+            models.Index(
+                fields=["challenge", "timing", "id"],
+                name="coregame_daily_ranking_idx",
+            ),
+        ]
@@ -0,0 +1,118 @@
+import base64
+import binascii
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+ESTIMATED_COUNT_THRESHOLD = 100000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(score: tuple) -> str:
+    """
+    Return an opaque cursor for a (board_size, timing, id) keyset position.
+    """
+    raw = ":".join(str(value) for value in score)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Return the (board_size, timing, id) keyset position of a cursor built by
+    encode_cursor(), raise InvalidCursor if it is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        board_size, timing, score_id = (int(value) for value in raw.split(":"))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor(cursor)
+    return board_size, timing, score_id
+
+
+def paginate_scores(scores, board_sizes: list, cursor: str = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> tuple:
+    """
+    Return a page of scores of the given board sizes ordered by (board_size,
+    timing, id) and the cursor of the next page, or None on the last page.
+
+    The page starts right after the cursor's position (keyset pagination), so
+    its cost does not grow with the amount of pages before it. Rows of the
+    queryset are expected to be values() dicts holding "id", "board_size" and
+    "timing".
+    """
+    scores = scores.filter(timing__isnull=False).order_by(
+        "board_size", "timing", "id"
+    )
+    if cursor is None:
+        page = list(scores.filter(board_size__in=board_sizes)[:limit + 1])
+    else:
+        board_size, timing, score_id = decode_cursor(cursor)
+        # Rest of the cursor's board size first, then the following sizes.
+        # Two plain range queries let the database seek straight to the
+        # cursor on the (board_size, timing, id) index instead of scanning
+        # from the start of the board size.
+        page = []
+        if board_size in board_sizes:
+            page = list(
+                scores.filter(board_size=board_size, timing__gte=timing)
+                .filter(Q(timing__gt=timing) | Q(id__gt=score_id))[:limit + 1]
+            )
+        if len(page) <= limit:
+            page += scores.filter(
+                board_size__in=[size for size in board_sizes
+                                if size > board_size]
+            )[:limit + 1 - len(page)]
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    last = page[-1]
+    return page, encode_cursor(
+        (last["board_size"], last["timing"], last["id"])
+    )
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses the database's row estimate as the count of big
+    unfiltered tables, instead of an exact (full scan) COUNT(*).
+
+    The estimate comes from the table statistics of PostgreSQL and MySQL and
+    is only used above ESTIMATED_COUNT_THRESHOLD rows. Filtered querysets and
+    other databases are counted exactly.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        estimate = self.estimated_count()
+        if estimate is not None and estimate > ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+        return super().count
+
+    def estimated_count(self) -> int:
+        query = getattr(self.object_list, "query", None)
+        if query is None or query.where or query.distinct:
+            return None
+        connection = connections[self.object_list.db]
+        table = self.object_list.model._meta.db_table
+        if connection.vendor == "postgresql":
+            sql = "SELECT reltuples FROM pg_class WHERE oid = %s::regclass"
+        elif connection.vendor == "mysql":
+            sql = (
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s"
+            )
+        else:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+        # PostgreSQL reports -1 rows on tables never vacuumed nor analysed
+        if not row or row[0] is None or row[0] < 0:
+            return None
+        return int(row[0])
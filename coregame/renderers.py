@@ -0,0 +1,39 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class PackedScoresRenderer(JSONRenderer):
+    """
+    Renderer selected when a client asks for the compact (packed) scores
+    layout, either through the Accept header or the "?format=packed" query.
+    """
+
+    media_type = "application/vnd.minesweeper.packed+json"
+    format = "packed"
+
+
+def pack_scores(rows) -> dict:
+    """
+    Pack an iterable of (player, timing, board_size) rows into a columnar
+    dict. Player names are interned on the "players" list and the "player"
+    column holds indexes into it.
+    """
+    players = []
+    interned = {}
+    player_col = []
+    timing_col = []
+    size_col = []
+    for player, timing, board_size in rows:
+        idx = interned.get(player)
+        if idx is None:
+            idx = interned[player] = len(players)
+            players.append(player)
+        player_col.append(idx)
+        timing_col.append(timing)
+        size_col.append(board_size)
+    return {
+        "format": PackedScoresRenderer.format,
+        "players": players,
+        "player": player_col,
+        "timing": timing_col,
+        "board_size": size_col,
+    }
@@ -11,6 +11,7 @@ const DEFAULT_BOARD_SIZE = 7;
 const MAX_VISIBLE_NICK_LEN = 10;
 const getTemplate = tmplName => document.querySelector(tmplName).innerHTML;
 const GAMEHOST = `http://${window.location.host}`;
+const PACKED_SCORES_TYPE = 'application/vnd.minesweeper.packed+json';
 
 
 /**
@@ -49,6 +50,7 @@ class LeaderBoard {
         this.host = host;
         this.getApiPath = 'coregame/scores';
         this.setApiPath = 'coregame/scores';
+        this.dailyApiPath = 'coregame/daily';
     }
 
 
@@ -98,8 +100,8 @@ class LeaderBoard {
     /**
      * Read current leaderboard from the game host system.
      *
-     * @param {Function} callback to handle the result. The arguments are
-     *  (err, data[]):
+     * @param {Function} callback to handle the result, ordered by board size
+     *  and timing. The arguments are (err, data[]):
      *      err (String): Error message ot Null
      *      data[].board_size: Board size to which this data relates to.
      *      data[].player: Player username (Nickname)
@@ -109,6 +111,7 @@ class LeaderBoard {
         fetch(`${this.host}/${this.getApiPath}/`, {
             method: 'GET',
             headers: {
+                "Accept": PACKED_SCORES_TYPE,
                 'Content-Type': 'application/json',
             },
         })
@@ -116,13 +119,119 @@ class LeaderBoard {
             .then(data => {
                 if (data["err"] != null) return callback(data["err"], null);
                 // Process the retrieved data
-                callback(null, data["scores"])
+                callback(null, data["format"] === 'packed' ?
+                    this.unpackScores_(data) : data["scores"])
             })
             .catch(error => {
                 // Handle any errors
                 callback(error, null)
             });
     }
+
+    /**
+     * Read today's challenge board of a given size.
+     *
+     * @param {Number} size - Size of the board.
+     * @param {Function} callback to handle the result. The arguments are
+     *  (err, challenge):
+     *      err (String): Error message or Null
+     *      challenge.mines: List of [row, col] cells holding a mine.
+     *      challenge.start: [row, col] blank cell to start from.
+     *      challenge.three_bv: Minimum amount of clicks to clear the board.
+     */
+    fetchDaily(size, callback) {
+        this.getJson_(`${this.host}/${this.dailyApiPath}/${size}/`,
+            (err, data) => callback(err, data && data["challenge"]));
+    }
+
+    /**
+     * Read the ranking of the challenge of a given size and day.
+     *
+     * @param {Number} size - Size of the board.
+     * @param {String} day - Day of the challenge (YYYY-MM-DD).
+     * @param {Function} callback to handle the result, best timing first.
+     *  The arguments are (err, data[]):
+     *      err (String): Error message or Null
+     *      data[].player: Player username (Nickname)
+     *      data[].timing: Duration in seconds to complete the game.
+     */
+    fetchDailyScores(size, day, callback) {
+        this.getJson_(
+            `${this.host}/${this.dailyApiPath}/${size}/scores/?day=${day}`,
+            (err, data) => callback(err, data && data["scores"]));
+    }
+
+    /**
+     * Submit a timing on the challenge of a given size and day.
+     *
+     * @param {Number} size - Size of the board.
+     * @param {String} day - Day of the challenge played (YYYY-MM-DD), the
+     *      server rejects it once the day is over.
+     * @param {Number} minutes - Minutes to solve the puzzle.
+     * @param {Number} seconds - Seconds to solve the puzzle.
+     * @param {Function} callback - Callback to process the return data,
+     *  modeled as: { err: "Error message", accepted: Boolean }
+     *  If accepted is true, then the timing is the player's best of the day.
+     */
+    setDailyScore(size, day, minutes, seconds, callback) {
+        fetch(`${this.host}/${this.dailyApiPath}/${size}/score/`, {
+            method: 'PUT',
+            headers: {
+                "X-CSRFToken": getCookie("csrftoken"),
+                "Accept": "application/json",
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                day: day,
+                timing: (parseInt(minutes) * 60) + parseInt(seconds),
+            }),
+        })
+            .then(response => response.json())
+            .then(data => callback(null, data))
+            .catch(error => callback(error, null));
+    }
+
+    /**
+     * GET a JSON document from the game host system.
+     *
+     * @param {String} url - URL to read.
+     * @param {Function} callback to handle the result. The arguments are
+     *  (err, data), err being the "err" attribute of the document, if any.
+     */
+    getJson_(url, callback) {
+        fetch(url, {
+            method: 'GET',
+            headers: {
+                "Accept": "application/json",
+            },
+        })
+            .then(response => response.json())
+            .then(data => {
+                if (data["err"] != null) return callback(data["err"], null);
+                callback(null, data)
+            })
+            .catch(error => callback(error, null));
+    }
+
+    /**
+     * Expand the packed (columnar) scores layout into a list of scores.
+     *
+     * @param {Object} data - Packed scores, with the "players" list of
+     *      interned names and the "player" (index into "players"), "timing"
+     *      and "board_size" columns.
+     * @returns {Array} Same list of scores the verbose layout returns.
+     */
+    unpackScores_(data) {
+        const scores = [];
+        for (let ii = 0; ii < data.timing.length; ii++) {
+            scores.push({
+                player: data.players[data.player[ii]],
+                timing: data.timing[ii],
+                board_size: data.board_size[ii],
+            });
+        }
+        return scores;
+    }
 }
 
 /**
@@ -212,6 +321,7 @@ let appData = {
     $mobileModeBtn: $('#mobile-help-id'),
     platfModeBtn: document.querySelectorAll('.platModeBtn'),
     playing: false,
+    daily: null, // day (YYYY-MM-DD) of the daily challenge being played
     mobilePlatf: (window.screen.width * window.screen.height) < 373500,
     stickyShiftKey: new StickyShiftKey(this.platfModeBtn),
 };
@@ -238,26 +348,30 @@ function notifyWin(size, mines, time) {
     let [min, sec] = time.split(":").map((v) => parseInt(v)), title, msg;
     const unit = min > 1 ? 'minutes' : min === 1 ? 'minute' : 'seconds';
     if (min === 0) { time = sec; }
-    appData.leaderboard.setScore(
-        size, min, sec, appData.nick, (err, data) => {
-            if (err || data.err) {
-                title = getTemplate('#errHeader');
-                msg = getTemplate('#errPhoningMsg')
-                    .replace(/{err}/g, err ? err : data.err);
-            } else if (data.accepted) {
-                title = getTemplate('#higherScoreHeader');
-                msg = getTemplate('#higherScoreMsg')
-                    .replace(/{size}/g, size)
-                    .replace(/{time}/g, time)
-                    .replace(/{unit}/g, unit);
-            } else {
-                title = getTemplate('#youWinHeader');
-                msg = getTemplate('#youWinMsg')
-                    .replace(/{time}/g, time)
-                    .replace(/{unit}/g, unit);
-            }
-            popModalUp(title, msg);
-        });
+    const submitScore = appData.daily ?
+        (callback) => appData.leaderboard.setDailyScore(
+            size, appData.daily, min, sec, callback) :
+        (callback) => appData.leaderboard.setScore(
+            size, min, sec, appData.nick, callback);
+    submitScore((err, data) => {
+        if (err || data.err) {
+            title = getTemplate('#errHeader');
+            msg = getTemplate('#errPhoningMsg')
+                .replace(/{err}/g, err ? err : data.err);
+        } else if (data.accepted) {
+            title = getTemplate('#higherScoreHeader');
+            msg = getTemplate('#higherScoreMsg')
+                .replace(/{size}/g, size)
+                .replace(/{time}/g, time)
+                .replace(/{unit}/g, unit);
+        } else {
+            title = getTemplate('#youWinHeader');
+            msg = getTemplate('#youWinMsg')
+                .replace(/{time}/g, time)
+                .replace(/{unit}/g, unit);
+        }
+        popModalUp(title, msg);
+    });
 }
 
 /**
@@ -274,6 +388,7 @@ function userNotification(result, size, mines, time) {
  * Handler for the 'Leaderboard' button.
  */
 function showLeaderboard() {
+    if (appData.daily) { return showDailyLeaderboard(); }
     let msg;
     appData.leaderboard.fetchScores((err, data) => {
         if (err) {
@@ -281,7 +396,6 @@ function showLeaderboard() {
         } else if (!data.length) {
             msg = getTemplate('#be1StWinner');
         } else {
-            data.sort((a, b) => a.board_size - b.board_size);
             msg = "<p>";
             for (let item of data) {
                 const bs = item.board_size;
@@ -296,6 +410,50 @@ function showLeaderboard() {
     });
 }
 
+/**
+ * Show the ranking of the daily challenge being played.
+ */
+function showDailyLeaderboard() {
+    const size = appData.minesweeper.boardDimension;
+    let msg;
+    appData.leaderboard.fetchDailyScores(size, appData.daily, (err, data) => {
+        if (err) {
+            msg = getTemplate('#errPhoningMsg').replace(/{err}/g, err);
+        } else if (!data.length) {
+            msg = getTemplate('#be1StWinner');
+        } else {
+            msg = "<p>";
+            data.forEach((item, idx) => {
+                const tm = `${Math.floor(item.timing / 60)}:${(
+                    item.timing % 60).toString().padStart(2, "0")}`;
+                msg += `<h5>${idx + 1}. ${tm} min. by ${item.player}</h5>`;
+            });
+            msg += '</p>';
+        }
+        popModalUp(getTemplate('#dailyLeaderboardTitle')
+            .replace(/{size}/g, size)
+            .replace(/{day}/g, appData.daily), msg);
+    });
+}
+
+/**
+ * Handler for the 'Daily' button, deal today's challenge of the current size.
+ */
+function playDaily() {
+    const size = appData.minesweeper.boardDimension;
+    appData.leaderboard.fetchDaily(size, (err, challenge) => {
+        if (err) {
+            popModalUp(getTemplate('#errHeader'),
+                getTemplate('#errPhoningMsg').replace(/{err}/g, err));
+            return;
+        }
+        appData.minesweeper.setPresetBoard(size, challenge.mines,
+            challenge.start);
+        appData.daily = challenge.day;
+        appData.$sizeDisplay.text(`${size}x${size} (daily)`);
+    });
+}
+
 /**
  * Handler for the 'Rules' button.
  */
@@ -363,6 +521,7 @@ function backToReg() {
  * @param {Number} dim - Dimension of the board in number of cells.
  */
 function setBoardDimension(dim) {
+    appData.daily = null;
     appData.minesweeper.setDimension(dim);
     appData.$sizeDisplay.text(`${dim}x${dim}`);
 }
@@ -410,6 +569,7 @@ $(function () {
         else if (target.id === 'hg-select-id') { setBoardDimension(20); }
         else if (target.id === 'rules-button-id') { showRules(); }
         else if (target.id === 'leaderBrd-button-id') { showLeaderboard(); }
+        else if (target.id === 'daily-button-id') { playDaily(); }
         else if (event.target.id === 'shareId') {
             popModalUp(getTemplate("#shareModalHeader"),
                 getTemplate("#shareModalBody"));
@@ -45,6 +45,8 @@ class Minesweeper {
         this.mineRatio = 15; // percentage of total cells
         this.mineCount = 0; // Counter based on user flags (displayed on screen)
         this.mineTotal = 0; // Actual amount of mines on the board
+        this.presetMines = null; // [row, col] mine cells of a preset board
+        this.startCell = null; // [row, col] suggested first cell to click
         // initialize other functionalities
         this.commonInit_();
         // event registration
@@ -73,6 +75,25 @@ class Minesweeper {
      */
     setDimension(dim) {
         this.boardDimension = parseInt(dim);
+        this.presetMines = null;
+        this.startCell = null;
+        this.processStartButton_();
+    }
+
+    /**
+     * Set a preset board (e.g. the daily challenge) and restart the game.
+     *
+     * The same board is dealt again on every restart, until a new dimension
+     * is set.
+     *
+     * @param {Number} dim - Dimension of the board.
+     * @param {Array} mines - List of [row, col] cells holding a mine.
+     * @param {Array} start - [row, col] cell highlighted as the first click.
+     */
+    setPresetBoard(dim, mines, start = null) {
+        this.boardDimension = parseInt(dim);
+        this.presetMines = mines;
+        this.startCell = start;
         this.processStartButton_();
     }
 
@@ -151,7 +172,7 @@ class Minesweeper {
      * Randomly fill the board with mines and the associated numbered cells.
      *
      * It also calculates the amount of mines based on a ratio
-     * (this.mineRatio).
+     * (this.mineRatio), unless a preset board was set (this.presetMines).
      */
     placeCellsAndMines_() {
         // Fill out board with blank cells
@@ -160,6 +181,10 @@ class Minesweeper {
                 this.board[row][col] = new BlankCell(row, col, this.board);
             }
         }
+        if (this.presetMines) {
+            this.placePresetMines_();
+            return;
+        }
         // compute amount of mines
         let mineCount = Math.ceil(
             Math.pow(this.boardDimension, 2) * this.mineRatio / 100);
@@ -178,6 +203,23 @@ class Minesweeper {
         } while (--mineCount);
     }
 
+    /**
+     * Place the mines of the preset board and highlight its start cell.
+     */
+    placePresetMines_() {
+        for (let [row, col] of this.presetMines) {
+            this.board[row][col] = new MineCell(row, col, this.board)
+                .enumerate(); // enumerate surrounding cells
+        }
+        this.mineCount = this.presetMines.length;
+        this.mineTotal = this.presetMines.length;
+        if (this.startCell) {
+            const [row, col] = this.startCell;
+            document.querySelector(`#r${row}-c${col}`)
+                .classList.add('start-cell');
+        }
+    }
+
     /**
      * Create the initial plain square board.
      *
@@ -1,3 +1,444 @@
-# from django.test import TestCase
+import datetime
+import io
+from unittest import mock
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from coregame import admin, daily, engine, pagination
+from coregame.api_views import ALLOWED_SIZES
+from coregame.models import DailyScore, GameScoring
+from coregame.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    paginate_scores,
+)
+from coregame.renderers import PackedScoresRenderer, pack_scores
 
-# Create your tests here.
+
+class ScoresPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ann = User.objects.create(username="ann")
+        cls.bob = User.objects.create(username="bob")
+        sizes = ALLOWED_SIZES + [99]  # 99 is not an allowed size
+        GameScoring.objects.bulk_create(
+            GameScoring(
+                player=cls.ann if ii % 3 else cls.bob,
+                timing=ii % 7 + 1,  # many ties on timing
+                board_size=sizes[ii % len(sizes)],
+            )
+            for ii in range(300)
+        )
+
+    def expected(self, **filters):
+        return list(
+            GameScoring.objects.filter(
+                board_size__in=ALLOWED_SIZES, **filters
+            )
+            .order_by("board_size", "timing", "id")
+            .values("player__username", "timing", "board_size")
+        )
+
+    def fetch_all(self, **params):
+        scores = []
+        cursor = None
+        while True:
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get("/coregame/scores/", params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            scores += data["scores"]
+            cursor = data["next"]
+            if cursor is None:
+                return scores
+
+    def as_rows(self, scores):
+        return [
+            {
+                "player__username": score["player"],
+                "timing": score["timing"],
+                "board_size": score["board_size"],
+            }
+            for score in scores
+        ]
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor((12, 34, 56))),
+                         (12, 34, 56))
+
+    def test_invalid_cursor(self):
+        for cursor in ["zz", encode_cursor((1, 2)), "MTI6YTo1"]:
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+        response = self.client.get("/coregame/scores/", {"cursor": "zz"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["err"], "Invalid cursor")
+
+    def test_pages_cross_board_sizes(self):
+        # 37 does not divide the rows of a board size, so pages straddle them
+        scores = self.fetch_all(limit=37)
+        self.assertEqual(self.as_rows(scores), self.expected())
+
+    def test_page_size(self):
+        scores = GameScoring.objects.values("id", "board_size", "timing")
+        page, cursor = paginate_scores(scores, ALLOWED_SIZES, limit=10)
+        self.assertEqual(len(page), 10)
+        self.assertIsNotNone(cursor)
+        page, cursor = paginate_scores(scores, ALLOWED_SIZES, limit=1000)
+        self.assertEqual(len(page), 250)
+        self.assertIsNone(cursor)
+
+    def test_filters(self):
+        scores = self.fetch_all(board_size=12, player="ann", limit=7)
+        self.assertEqual(
+            self.as_rows(scores),
+            self.expected(board_size=12, player=self.ann),
+        )
+        self.assertEqual(self.fetch_all(board_size=99), [])
+
+    def test_bad_parameters(self):
+        for params in [{"limit": 0}, {"limit": 1001}, {"limit": "x"},
+                       {"board_size": "x"}]:
+            response = self.client.get("/coregame/scores/", params)
+            self.assertEqual(response.status_code, 400)
+
+
+class PackedScoresTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        players = [User.objects.create(username=name)
+                   for name in ["ann", "bob", "cid"]]
+        GameScoring.objects.bulk_create(
+            GameScoring(player=players[ii % 3], timing=ii + 1,
+                        board_size=ALLOWED_SIZES[ii % 2])
+            for ii in range(30)
+        )
+
+    def unpack(self, data):
+        return [
+            {
+                "player": data["players"][player],
+                "timing": timing,
+                "board_size": board_size,
+            }
+            for player, timing, board_size in zip(
+                data["player"], data["timing"], data["board_size"]
+            )
+        ]
+
+    def test_pack_scores_interns_players(self):
+        packed = pack_scores(
+            [("ann", 10, 7), ("bob", 20, 7), ("ann", 30, 10), ("bob", 5, 12)]
+        )
+        self.assertEqual(packed, {
+            "format": "packed",
+            "players": ["ann", "bob"],
+            "player": [0, 1, 0, 1],
+            "timing": [10, 20, 30, 5],
+            "board_size": [7, 7, 10, 12],
+        })
+
+    def test_packed_matches_verbose(self):
+        params = {"limit": 12}
+        verbose = self.client.get("/coregame/scores/", params)
+        self.assertEqual(verbose["Content-Type"], "application/json")
+        verbose = verbose.json()
+        packed_requests = [
+            self.client.get("/coregame/scores/", params,
+                            HTTP_ACCEPT=PackedScoresRenderer.media_type),
+            self.client.get("/coregame/scores/",
+                            {**params, "format": "packed"}),
+        ]
+        for response in packed_requests:
+            self.assertEqual(response["Content-Type"],
+                             PackedScoresRenderer.media_type)
+            data = response.json()
+            self.assertEqual(len(data["players"]), 3)
+            self.assertEqual(self.unpack(data), verbose["scores"])
+            self.assertEqual(data["next"], verbose["next"])
+        response = self.client.get(
+            "/coregame/scores/", {**params, "cursor": verbose["next"]},
+            HTTP_ACCEPT=PackedScoresRenderer.media_type,
+        )
+        self.assertEqual(len(response.json()["timing"]), 12)
+
+    def test_vary_accept(self):
+        for accept in [PackedScoresRenderer.media_type, "application/json"]:
+            response = self.client.get("/coregame/scores/",
+                                       HTTP_ACCEPT=accept)
+            self.assertIn("Accept", response["Vary"])
+
+    def test_other_accept_get_verbose(self):
+        for accept in ["text/html", "application/json", "*/*"]:
+            response = self.client.get("/coregame/scores/",
+                                       HTTP_ACCEPT=accept)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()["scores"]), 30)
+            self.assertNotIn("format", response.json())
+
+
+class EngineTest(TestCase):
+    def test_three_bv(self):
+        # A single blank area reveals every number
+        self.assertEqual(engine.three_bv(3, frozenset({(0, 0)})), 1)
+        # Two blank areas cover all the numbers between them
+        self.assertEqual(engine.three_bv(3, frozenset({(0, 0), (2, 2)})), 2)
+        # No blank cell, each number takes a click
+        self.assertEqual(engine.three_bv(2, frozenset({(0, 0)})), 3)
+
+    def test_is_solvable(self):
+        self.assertTrue(engine.is_solvable(3, frozenset({(0, 0)}), (2, 2)))
+        # The two mines on the top row follow from the 2s below them
+        mines = frozenset({(0, 0), (0, 1)})
+        self.assertTrue(engine.is_solvable(3, mines, (2, 0)))
+        # A lone 1 with three hidden cells around it needs a guess
+        self.assertFalse(engine.is_solvable(2, frozenset({(0, 0)}), (1, 1)))
+
+
+class DailyChallengeTest(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        call_command("generate_daily_challenges", stdout=io.StringIO())
+        self.challenge = daily.get_challenge(daily.today(), 7)
+        self.players = [
+            User.objects.create(username=f"player{ii}") for ii in range(4)
+        ]
+
+    def test_generated_board(self):
+        challenge = self.challenge
+        mines = frozenset(tuple(cell) for cell in challenge.mines)
+        start = (challenge.start_row, challenge.start_col)
+        self.assertEqual(len(mines), engine.mine_count(7))
+        self.assertEqual(engine.count_board(7, mines)[start[0]][start[1]], 0)
+        self.assertEqual(challenge.three_bv, engine.three_bv(7, mines))
+        self.assertEqual(challenge.solvable,
+                         engine.is_solvable(7, mines, start))
+
+    def test_fallback_board_has_safe_start(self):
+        with mock.patch.object(engine, "mine_count", return_value=40):
+            board = daily.generate_board(3, 10)
+        self.assertFalse(board["solvable"])
+        self.assertNotIn([board["start_row"], board["start_col"]],
+                         board["mines"])
+        with mock.patch.object(engine, "mine_count", return_value=15):
+            with self.assertRaises(ValueError):
+                daily.generate_board(1, 4)
+
+    def test_submit_score_ordering(self):
+        for player, timing in zip(self.players, [40, 30, 30, 50]):
+            self.assertTrue(daily.submit_score(self.challenge, player, timing))
+        # Only improvements are accepted
+        self.assertFalse(daily.submit_score(self.challenge,
+                                            self.players[0], 45))
+        self.assertTrue(daily.submit_score(self.challenge,
+                                           self.players[3], 20))
+        expected = [("player3", 20), ("player1", 30), ("player2", 30),
+                    ("player0", 40)]
+        ranking = [(player, timing)
+                   for timing, _, player in daily.get_ranking(self.challenge)]
+        self.assertEqual(ranking, expected)
+        # The cached ranking matches the one built from the database
+        caches[daily.RANKING_CACHE].clear()
+        ranking = [(player, timing)
+                   for timing, _, player in daily.get_ranking(self.challenge)]
+        self.assertEqual(ranking, expected)
+
+    def test_ranking_size(self):
+        with mock.patch.object(daily, "RANKING_SIZE", 2):
+            for player, timing in zip(self.players, [40, 30, 20, 10]):
+                daily.submit_score(self.challenge, player, timing)
+            self.assertEqual(
+                [timing for timing, _, _ in daily.get_ranking(self.challenge)],
+                [10, 20],
+            )
+
+    def test_daily_scores_queries(self):
+        daily.submit_score(self.challenge, self.players[0], 60)
+        # The challenge comes from the process' cache, the ranking from the
+        # shared one
+        with self.assertNumQueries(1):
+            response = self.client.get("/coregame/daily/7/scores/")
+        self.assertEqual(response.json()["scores"],
+                         [{"player": "player0", "timing": 60}])
+
+    def test_force_resets_ranking(self):
+        daily.submit_score(self.challenge, self.players[0], 30)
+        out = io.StringIO()
+        call_command("generate_daily_challenges", "--force", stdout=out)
+        self.assertIn("regenerated", out.getvalue())
+        self.assertFalse(DailyScore.objects.exists())
+        challenge = daily.get_challenge(daily.today(), 7)
+        self.assertEqual(daily.get_ranking(challenge), [])
+
+    def put_score(self, timing, day=None):
+        day = day or daily.today()
+        return self.client.put(
+            "/coregame/daily/7/score/",
+            {"timing": timing, "day": day.isoformat()},
+            content_type="application/json",
+        )
+
+    def test_set_daily_score(self):
+        self.client.force_login(self.players[0])
+        self.assertEqual(self.put_score(1).status_code, 400)
+        response = self.put_score(60)
+        self.assertEqual(response.json(), {"err": None, "accepted": True})
+        response = self.client.get("/coregame/daily/7/scores/")
+        self.assertEqual(response.json()["scores"],
+                         [{"player": "player0", "timing": 60}])
+
+    def test_set_daily_score_of_past_day(self):
+        # A board started before midnight and won after it
+        yesterday = daily.today() - datetime.timedelta(days=1)
+        daily.create_challenge(yesterday, 7)
+        self.client.force_login(self.players[0])
+        response = self.put_score(60, yesterday)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["err"], "Challenge over")
+        response = self.client.put(
+            "/coregame/daily/7/score/", {"timing": 60},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(DailyScore.objects.exists())
+
+    def test_daily_scores_of_day(self):
+        yesterday = daily.today() - datetime.timedelta(days=1)
+        old = daily.create_challenge(yesterday, 7)[0]
+        daily.submit_score(old, self.players[1], 90)
+        daily.submit_score(self.challenge, self.players[0], 60)
+        url = "/coregame/daily/7/scores/"
+        response = self.client.get(url, {"day": yesterday.isoformat()})
+        self.assertEqual(response.json()["scores"],
+                         [{"player": "player1", "timing": 90}])
+        response = self.client.get(url)
+        self.assertEqual(response.json()["scores"],
+                         [{"player": "player0", "timing": 60}])
+        tomorrow = daily.today() + datetime.timedelta(days=1)
+        daily.create_challenge(tomorrow, 7)
+        response = self.client.get(url, {"day": tomorrow.isoformat()})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(url, {"day": "x"})
+        self.assertEqual(response.status_code, 400)
+
+
+class GameScoringAdminTest(TestCase):
+    url = "/admin/coregame/gamescoring/"
+
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser("root", "root@example.com", "pw")
+        )
+        player = User.objects.create(username="ann")
+        GameScoring.objects.bulk_create(
+            GameScoring(player=player, timing=ii + 1,
+                        board_size=ALLOWED_SIZES[ii % 2])
+            for ii in range(50)
+        )
+
+    def test_board_size_filter(self):
+        response = self.client.get(self.url, {"board_size": 7})
+        self.assertEqual(response.context["cl"].result_count, 25)
+        for value in ["abc", "99"]:
+            response = self.client.get(self.url, {"board_size": value})
+            self.assertRedirects(response, self.url + "?e=1",
+                                 fetch_redirect_response=False)
+
+    def postgresql(self, reltuples):
+        """
+        Patch the paginator's connection with a PostgreSQL one whose pg_class
+        holds the given reltuples.
+        """
+        connection = mock.MagicMock(vendor="postgresql")
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (reltuples,)
+        return mock.patch.object(pagination, "connections",
+                                 {"default": connection})
+
+    def test_estimated_count(self):
+        estimate = pagination.ESTIMATED_COUNT_THRESHOLD + 1
+        with self.postgresql(estimate):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context["cl"].result_count, estimate)
+
+    def test_estimated_count_filtered(self):
+        estimate = pagination.ESTIMATED_COUNT_THRESHOLD + 1
+        for params, count in [({"board_size": 7}, 25), ({"q": "ann"}, 50)]:
+            with self.postgresql(estimate) as connections:
+                response = self.client.get(self.url, params)
+            self.assertEqual(response.context["cl"].result_count, count)
+            connections["default"].cursor.assert_not_called()
+
+    def test_estimated_count_not_analysed(self):
+        with self.postgresql(-1) as connections:
+            response = self.client.get(self.url)
+        self.assertEqual(response.context["cl"].result_count, 50)
+        connections["default"].cursor.assert_called_once()
+
+    def delete_board_size(self, board_size):
+        return self.client.post(
+            f"{self.url}?board_size={board_size}",
+            {
+                "action": "delete_in_batches",
+                "select_across": "1",
+                "index": "0",
+                "_selected_action": [GameScoring.objects.first().pk],
+            },
+            follow=True,
+        )
+
+    def test_delete_in_batches(self):
+        with mock.patch.object(admin, "ACTION_BATCH_SIZE", 7):
+            self.delete_board_size(7)
+        self.assertFalse(GameScoring.objects.filter(board_size=7).exists())
+        self.assertEqual(GameScoring.objects.count(), 25)
+        self.assertEqual(
+            LogEntry.objects.filter(action_flag=DELETION).count(), 25
+        )
+
+    def test_delete_in_batches_cap(self):
+        with mock.patch.object(admin, "ACTION_BATCH_SIZE", 7), \
+                mock.patch.object(admin, "ACTION_MAX_ROWS", 10):
+            response = self.delete_board_size(7)
+        self.assertEqual(GameScoring.objects.filter(board_size=7).count(), 15)
+        self.assertContains(response, "run the action again")
+
+
+class SimulateGamesTest(TestCase):
+    def test_report(self):
+        out = io.StringIO()
+        call_command("simulate_games", "--sizes", "7", "--ratios", "10", "15",
+                     "--games", "20", "--batch", "8", "--workers", "1",
+                     stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[1].split()[:4], ["7", "10%", "5", "20"])
+
+    def test_bad_options(self):
+        for option in ["--games", "--batch", "--workers"]:
+            with self.assertRaises(CommandError):
+                call_command("simulate_games", option, "0",
+                             stdout=io.StringIO())
+        with self.assertRaises(CommandError):
+            call_command("simulate_games", "--ratios", "100",
+                         stdout=io.StringIO())
+
+
+class BenchScoresTest(TestCase):
+    def test_report(self):
+        out = io.StringIO()
+        call_command("bench_scores", "--entries", "2500", "--players", "20",
+                     "--repeat", "1", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[0].startswith("2500 scores"))
+        self.assertIn("(3 pages)", lines[2])
+        self.assertIn("(3 pages)", lines[4])
+        # The seeded scores are rolled back
+        self.assertFalse(GameScoring.objects.exists())
+        self.assertFalse(User.objects.exists())
@@ -108,6 +108,24 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# "default" is a memory cache of each process, holding copies of the daily
+# challenges for a few minutes. "shared" is shared by all the workers and
+# holds the daily rankings (see coregame.daily); create its table with
+# "manage.py createcachetable".
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "coregame_cache",
+    },
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -28,5 +28,6 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("coregame/play/", include("coregame.urls")),
     path("coregame/scores/", include("coregame.api_urls")),
+    path("coregame/daily/", include("coregame.daily_urls")),
     path("accounts/", include("accounts.urls")),
 ]